@@ -9,7 +9,7 @@ USAGE: ./generate.py [NUM] [-a 'L-U'] [-b 'L-U'] [-o FILENAME]
 
 import sys
 from argparse import ArgumentParser
-from random import randint
+from random import choices
 from typing import List, Tuple
 
 __author__ = "Vincent Lin"
@@ -49,19 +49,20 @@ def split_range_string(s: str) -> Tuple[int, int]:
 
 
 def get_random_times(num: int, lower: int, upper: int) -> List[int]:
-    return [randint(lower, upper) for _ in range(num)]
+    return choices(range(lower, upper + 1), k=num)
 
 
 def to_txt_format(arrival_times: List[int], burst_times: List[int]) -> str:
     num_entries = len(arrival_times)
-    content = str(num_entries)  # First line.
+    lines = [str(num_entries)]  # First line.
 
     zipped = zip(arrival_times, burst_times)
-    for pid, (arrival_time, burst_time) in enumerate(zipped, start=1):
-        content += f"\n{pid}, {arrival_time}, {burst_time}"
+    lines += [f"{pid}, {arrival_time}, {burst_time}"
+              for pid, (arrival_time, burst_time)
+              in enumerate(zipped, start=1)]
 
-    content += "\n"
-    return content
+    lines.append("")  # Trailing newline.
+    return "\n".join(lines)
 
 
 def main() -> None:
@@ -93,14 +94,17 @@ def main() -> None:
     arrival_times = get_random_times(num, arrival_lower, arrival_upper)
     burst_times = get_random_times(num, burst_lower, burst_upper)
 
-    print(" ".join(str(time) for time in arrival_times))
-    print(" ".join(str(time) for time in burst_times))
+    arrivals_string = " ".join(map(str, arrival_times))
+    bursts_string = " ".join(map(str, burst_times))
+    sys.stdout.write(f"{arrivals_string}\n{bursts_string}\n")
 
     output_path = namespace.output
     if output_path is not None:
         content = to_txt_format(arrival_times, burst_times)
-        with open(output_path, "wt", encoding="utf-8") as fp:
-            fp.write(content)
+        # Encode once and skip the text layer since the content is
+        # already fully built.
+        with open(output_path, "wb") as fp:
+            fp.write(content.encode("utf-8"))
 
 
 if __name__ == "__main__":
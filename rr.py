@@ -13,9 +13,9 @@ Author: Vincent Lin
 Usage: ./rr.py INPUT_FILE QUANTUM_LENGTH
 """
 
+import csv
 import sys
-from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterator, List, Optional
 
@@ -33,16 +33,28 @@ class process_t:
     arrival_time: int
     burst_time: int
 
+    # Simulate TAILQ_ENTRY(process) pointers.  These are managed by
+    # process_list_t, so you shouldn't need to touch them yourself.
+    _prev: Optional["process_t"] = field(default=None, init=False,
+                                         repr=False, compare=False)
+    _next: Optional["process_t"] = field(default=None, init=False,
+                                         repr=False, compare=False)
+
     # Additional fields.
     pass
 
 
 class process_list_t:
-    """Wrapper of collections.deque to simulate the TAILQ API."""
+    """Doubly linked list of process_t to simulate the TAILQ API."""
+
+    # Like the TAILQ_ENTRY fields in C, process_t's _prev/_next pointers
+    # are only meant to be managed by the list operations below.
+    # pylint: disable=protected-access
 
     def __init__(self) -> None:
-        """Use the composition design pattern to wrap a deque."""
-        self._queue: deque[process_t] = deque()
+        """Like TAILQ_HEAD, keep track of the two ends of the list."""
+        self._head: Optional[process_t] = None
+        self._tail: Optional[process_t] = None
 
     def __repr__(self) -> str:
         """Implement a debugging-friendly string representation.
@@ -51,7 +63,7 @@ class process_list_t:
         """
         INDENT = " "*4
         formatted_elements = "\n".join(f"{INDENT}{element}"
-                                      for element in self._queue)
+                                      for element in self)
         if formatted_elements == "":
             content = ""
         else:
@@ -61,101 +73,136 @@ class process_list_t:
         return f"{class_name}({content})"
 
     def __iter__(self) -> Iterator[process_t]:
-        """Implement for-in iteration to simulate TAILQ_FOREACH."""
-        return iter(self._queue)
+        """Implement for-in iteration to simulate TAILQ_FOREACH.
+
+        The next element is fetched before the current one is yielded,
+        so it is safe to remove the current element while iterating.
+        """
+        element = self._head
+        while element is not None:
+            next_element = element._next
+            yield element
+            element = next_element
 
     def empty(self) -> bool:
         """Return whether the queue has zero elements in it."""
-        return len(self._queue) == 0
+        return self._head is None
 
     def first(self) -> Optional[process_t]:
         """Return the first element in the queue, or None if empty."""
-        if self.empty():
-            return None
-        return self._queue[0]
+        return self._head
 
     def last(self) -> Optional[process_t]:
         """Return the last element in the queue, or None if empty."""
-        if self.empty():
-            return None
-        return self._queue[-1]
+        return self._tail
 
     def prev(self, element: process_t) -> Optional[process_t]:
         """
         Return the previous element in the queue, or None if the given
-        element is the first element.  Note that because deque does not
-        expose the underlying pointers, this wrapper uses deque.index()
-        followed by subscripting, which is redundant time overhead.
+        element is the first element.
         """
-        if element == self.first():
-            return None
-        index = self._queue.index(element)  # This can raise.
-        return self._queue[index-1]
+        return element._prev
 
     def next(self, element: process_t) -> Optional[process_t]:
         """
         Return the next element in the queue, or None if the given
-        element is the last element.  Note that because deque does not
-        expose the underlying pointers, this wrapper uses deque.index()
-        followed by subscripting, which is redundant time overhead.
+        element is the last element.
         """
-        if element == self.last():
-            return None
-        index = self._queue.index(element)  # This can raise.
-        return self._queue[index+1]
+        return element._next
+
+    def _check_linked(self, element: process_t) -> None:
+        """Raise ValueError if the element is not in the queue."""
+        if element._prev is None and self._head is not element:
+            raise ValueError(f"{element} is not in the queue")
+
+    def _check_unlinked(self, element: process_t) -> None:
+        """Raise ValueError if the element is already in a queue."""
+        if (element._prev is not None or element._next is not None
+                or self._head is element):
+            raise ValueError(f"{element} is already in a queue")
 
     def remove(self, element: process_t) -> None:
-        """Remove the element from the queue."""
-        self._queue.remove(element)
+        """
+        Remove the element from the queue.  Unlike TAILQ_REMOVE, this
+        raises ValueError instead of corrupting the queue if the element
+        is not in it.
+        """
+        self._check_linked(element)
+        if element._prev is None:
+            self._head = element._next
+        else:
+            element._prev._next = element._next
+        if element._next is None:
+            self._tail = element._prev
+        else:
+            element._next._prev = element._prev
+        element._prev = element._next = None
 
     def insert_head(self, element: process_t) -> None:
         """Insert a new element at the head of the queue."""
-        self._queue.appendleft(element)
+        self._check_unlinked(element)
+        if self._head is None:
+            self._tail = element
+        else:
+            self._head._prev = element
+        element._prev = None
+        element._next = self._head
+        self._head = element
 
     def insert_tail(self, element: process_t) -> None:
         """Insert a new element at the tail of the queue."""
-        self._queue.append(element)
+        self._check_unlinked(element)
+        if self._tail is None:
+            self._head = element
+        else:
+            self._tail._next = element
+        element._prev = self._tail
+        element._next = None
+        self._tail = element
 
     def insert_before(self, existing: process_t, element: process_t) -> None:
-        """
-        Insert an element before an existing one in the queue.  Note
-        that because deque does not expose the underlying pointers, this
-        wrapper uses deque.index() followed by deque.insert(), which is
-        redundant time overhead.
-        """
-        index = self._queue.index(existing)
-        self._queue.insert(index, element)
+        """Insert an element before an existing one in the queue."""
+        self._check_linked(existing)
+        self._check_unlinked(element)
+        if existing._prev is None:
+            self._head = element
+        else:
+            existing._prev._next = element
+        element._prev = existing._prev
+        element._next = existing
+        existing._prev = element
 
     def insert_after(self, existing: process_t, element: process_t) -> None:
-        """
-        Insert an element after an existing one in the queue.  Note
-        that because deque does not expose the underlying pointers, this
-        wrapper uses deque.index() followed by deque.insert(), which is
-        redundant time overhead.
-        """
-        index = self._queue.index(existing)
-        self._queue.insert(index + 1, element)
+        """Insert an element after an existing one in the queue."""
+        self._check_linked(existing)
+        self._check_unlinked(element)
+        if existing._next is None:
+            self._tail = element
+        else:
+            existing._next._prev = element
+        element._prev = existing
+        element._next = existing._next
+        existing._next = element
 
 
 def init_processes(file_path: Path) -> List[process_t]:
     """Parse input file and return a list of represented processes."""
     data: List[process_t] = []
 
-    with file_path.open("rt", encoding="utf-8") as fp:
-        # Ignore the first line as that's not needed in Python.
-        fp.readline()
-
-        for line in fp:
-            nums = [int(s.strip()) for s in line.rstrip().split(",")]
-            pid, arrival_time, burst_time = nums
-
-            # If you choose to add fields to process_t, update this:
-            process = process_t(
-                pid=pid,
-                arrival_time=arrival_time,
-                burst_time=burst_time
-            )
-            data.append(process)
+    # Read the whole file in one go instead of line by line.  Ignore the
+    # first line as that's not needed in Python.
+    lines = file_path.read_text(encoding="utf-8").splitlines()[1:]
+
+    for row in csv.reader(lines, skipinitialspace=True):
+        pid, arrival_time, burst_time = map(int, row)
+
+        # If you choose to add fields to process_t, update this:
+        process = process_t(
+            pid=pid,
+            arrival_time=arrival_time,
+            burst_time=burst_time
+        )
+        data.append(process)
 
     return data
 
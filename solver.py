@@ -12,196 +12,232 @@ USAGE: `./solver.py FILENAME`, where FILENAME is the name of the file
 into which you paste the HTML of the solver webpage.
 """
 
+import re
 import sys
-from html.parser import HTMLParser
-from typing import Dict, List, Literal, Optional, Set, Tuple
+from typing import Dict, List, Literal
 
 __author__ = "Vincent Lin"
 
-AttrsList = List[Tuple[str, Optional[str]]]
+# Any start or end tag, for stripping child markup out of a cell.
+TAG_PATTERN = re.compile(rb"<[^>]*>")
 
 
-class GanttChartParser(HTMLParser):
-    OUTERMOST_DIV_CLASSNAME = "sc-a3b21388-0 evwFKR"
-    COMBINED_ROW_DIV_CLASSNAME = "sc-a3b21388-6 dmgGsv"
+def get_cell_text(fragment: bytes) -> bytes:
+    """Return the text of an HTML fragment with any tags removed."""
+    return TAG_PATTERN.sub(b"", fragment).strip()
+
+
+class GanttChartParser:
+    OUTERMOST_DIV_CLASSNAME = b"sc-a3b21388-0 evwFKR"
+    COMBINED_ROW_DIV_CLASSNAME = b"sc-a3b21388-6 dmgGsv"
+
+    # Tag and attribute names are case-insensitive in HTML, like they were
+    # for html.parser.  Class names themselves are compared exactly.
+    OUTERMOST_DIV_CLASS_PATTERN = re.compile(
+        rb'class="' + re.escape(OUTERMOST_DIV_CLASSNAME) + rb'"',
+        re.IGNORECASE,
+    )
+    # A <div> start or end tag and its class attribute, if any.
+    DIV_TAG_PATTERN = re.compile(
+        rb"<(/?)div\b(?:[^>]*?\sclass=\"([^\"]*)\")?[^>]*>",
+        re.IGNORECASE,
+    )
 
     def __init__(self) -> None:
-        super().__init__()
-        self.in_gantt_chart = False
-        self.in_combined_row = False
-        self.in_pids_row = False
-        self.in_times_row = False
-        self.in_pid_cell = False
-        self.in_time_cell = False
-        # PIDs <div> comes before times <div>.
-        self.next_row_type: Literal["pids", "times"] = "pids"
-        self.pids: List[str] = []
+        self.pids: List[bytes] = []
         self.times: List[int] = []
 
-    def handle_starttag(self, tag: str, attrs: AttrsList) -> None:
-        if tag != "div":
-            return
-
-        class_attr = dict(attrs).get("class")
-
-        # Check inner -> outer to see if we entered a child
-        if self.in_pids_row:
-            self.in_pid_cell = True
-        elif self.in_times_row:
-            self.in_time_cell = True
-        elif self.in_combined_row:
-            self.update_current_row_type()
-        elif self.in_gantt_chart:
-            # If the chart DOESN'T wrap, the "combined row" <div> layer
-            # doesn't exist, in which case, direct children of the Gantt
-            # Chart <div> would be PIDs/times rows.
-            if class_attr == self.COMBINED_ROW_DIV_CLASSNAME:
-                self.in_combined_row = True
-            else:
-                self.update_current_row_type()
-        elif class_attr == self.OUTERMOST_DIV_CLASSNAME:
-            self.in_gantt_chart = True
-
-    def update_current_row_type(self) -> None:
-        if self.next_row_type == "pids":
-            self.in_pids_row = True
-            self.next_row_type = "times"
-        else:
-            self.in_times_row = True
-            self.next_row_type = "pids"
-
-    def handle_endtag(self, tag: str) -> None:
-        if tag != "div":
-            return
-
-        # Check inner -> outer to see which endtag we just encountered
-        if self.in_pid_cell:
-            self.in_pid_cell = False
-        elif self.in_time_cell:
-            self.in_time_cell = False
-        elif self.in_pids_row:
-            self.in_pids_row = False
-        elif self.in_times_row:
-            self.in_times_row = False
-        elif self.in_combined_row:
-            self.in_combined_row = False
-        elif self.in_gantt_chart:
-            self.in_gantt_chart = False
-
-    def handle_data(self, data: str) -> None:
-        if self.in_pid_cell:
-            self.pids.append(data)
-        elif self.in_time_cell:
-            time = int(data)
-            # If the chart wraps, the end time of one row and start time
-            # of the next is the same, and we don't want duplicates.
-            if not self.times or self.times[-1] != time:
-                self.times.append(int(data))
-
-    def get_pids(self) -> List[str]:
+    def feed(self, data: bytes) -> None:
+        # Nesting level relative to the Gantt Chart <div> (0 if outside
+        # of it) and the level at which the PIDs/times rows are found.
+        depth = 0
+        row_depth = 2
+        # PIDs <div> comes before times <div>.
+        next_row_type: Literal["pids", "times"] = "pids"
+        row_type = next_row_type
+        # Times are converted to int in one pass at the end.
+        time_texts: List[bytes] = []
+        # Where the content of the current PID/time cell begins.
+        cell_start = 0
+
+        # Look these up once instead of once per <div>.
+        combined_row_classname = self.COMBINED_ROW_DIV_CLASSNAME
+        append_pid = self.pids.append
+        append_time_text = time_texts.append
+
+        # Skip straight to the Gantt Chart <div> with a single search
+        # instead of matching every <div> that comes before it.
+        chart_match = self.OUTERMOST_DIV_CLASS_PATTERN.search(data)
+        if chart_match is None:
+            raise ValueError(
+                "Unexpectedly unable to find the Gantt Chart in the HTML.")
+        chart_start = data.rfind(b"<", 0, chart_match.start())
+
+        for match in self.DIV_TAG_PATTERN.finditer(data, chart_start):
+            is_endtag, class_attr = match.groups()
+
+            if is_endtag:
+                # The scan may start on a non-<div> tag with the same class,
+                # so ignore end tags until the chart itself is entered.
+                if depth == 0:
+                    continue
+                # Nothing after the Gantt Chart <div> is of interest.
+                if depth == 1:
+                    break
+                if depth == row_depth + 1:
+                    # A cell may wrap its text in child markup, so take
+                    # everything up to its end tag and strip the tags.
+                    text = get_cell_text(data[cell_start:match.start()])
+                    if row_type == "pids":
+                        append_pid(text)
+                    # If the chart wraps, the end time of one row and start
+                    # time of the next is the same, and we don't want
+                    # duplicates.
+                    elif not time_texts or time_texts[-1] != text:
+                        append_time_text(text)
+                depth -= 1
+                continue
+
+            if depth == 0:
+                if class_attr == self.OUTERMOST_DIV_CLASSNAME:
+                    depth = 1
+                continue
+
+            depth += 1
+            if depth == 2:
+                # If the chart DOESN'T wrap, the "combined row" <div> layer
+                # doesn't exist, in which case, direct children of the Gantt
+                # Chart <div> would be PIDs/times rows.
+                if class_attr == combined_row_classname:
+                    row_depth = 3
+                    continue
+                row_depth = 2
+
+            if depth == row_depth:
+                row_type = next_row_type
+                next_row_type = "times" if row_type == "pids" else "pids"
+            elif depth == row_depth + 1:
+                cell_start = match.end()
+
+        # Every slot has a PID and the chart ends with one extra end time,
+        # so anything else means the chart was not read correctly.
+        if not self.pids or len(time_texts) != len(self.pids) + 1:
+            raise ValueError(
+                f"Unexpectedly read {len(self.pids)} PIDs and "
+                f"{len(time_texts)} times from the Gantt Chart.")
+
+        self.times.extend(map(int, time_texts))
+
+    def get_pids(self) -> List[bytes]:
         return self.pids
 
     def get_times(self) -> List[int]:
         return self.times
 
 
-class OutputTableParser(HTMLParser):
-    def __init__(self) -> None:
-        super().__init__()
-
-        self.in_tbody = False
-        self.in_tr = False
-        self.in_td = False
-
-        self.tds_in_tr_encountered = 0
-        self.average_found = False
-        self.turnaround_found = False
+class OutputTableParser:
+    # Tag names are case-insensitive in HTML, like they were for
+    # html.parser.
+    TBODY_START_PATTERN = re.compile(rb"<tbody\b", re.IGNORECASE)
+    TBODY_END_PATTERN = re.compile(rb"</tbody\s*>", re.IGNORECASE)
+    ROW_PATTERN = re.compile(rb"<tr\b[^>]*>(.*?)</tr>",
+                             re.DOTALL | re.IGNORECASE)
+    CELL_PATTERN = re.compile(rb"<td\b[^>]*>(.*?)</td>",
+                              re.DOTALL | re.IGNORECASE)
 
-        self.current_pid: Optional[str] = None
+    def __init__(self) -> None:
         self.average_waiting_time = float("inf")
-        self.arrival_times: Dict[str, int] = {}
+        self.arrival_times: Dict[bytes, int] = {}
 
-    def handle_starttag(self, tag: str, attrs: AttrsList) -> None:
+    def feed(self, data: bytes) -> None:
         # There should be exactly one <tbody>, that of the output table.
-        if tag == "tbody":
-            self.in_tbody = True
-        elif tag == "tr":
-            self.in_tr = True
-        elif tag == "td":
-            self.in_td = True
-            self.tds_in_tr_encountered += 1
-
-    def handle_endtag(self, tag: str) -> None:
-        # Check inner -> outer to see which endtag we just encountered.
-        if tag == "td":
-            self.in_td = False
-        elif tag == "tr":
-            self.in_tr = False
-            self.tds_in_tr_encountered = 0  # Reset.
-        elif tag == "tbody":
-            self.in_tbody = False
-
-    def handle_data(self, data: str) -> None:
-        if not self.in_td:
-            return
-
-        # Handle the special last row (averages).
-        if data == "Average":
-            self.average_found = True
-            return
-        if self.average_found:
-            # Average waiting time comes after the one for turnaround.
-            if self.turnaround_found:
-                self.average_waiting_time = float(data.split()[-1])
-            else:
-                self.turnaround_found = True
-            return
-
-        # PID is field $1.
-        if self.tds_in_tr_encountered == 1:
-            self.current_pid = data
-
-        # Arrival Time is field $2.
-        elif self.tds_in_tr_encountered == 2:
-            if self.current_pid is None:
+        # Find its bounds first and only scan rows in between.
+        tbody_start_match = self.TBODY_START_PATTERN.search(data)
+        tbody_end_match = None
+        if tbody_start_match is not None:
+            tbody_end_match = self.TBODY_END_PATTERN.search(
+                data, tbody_start_match.end())
+        if tbody_start_match is None or tbody_end_match is None:
+            raise ValueError(
+                "Unexpectedly unable to find the output table in the HTML.")
+        tbody_start = tbody_start_match.start()
+        tbody_end = tbody_end_match.start()
+
+        # Look these up once instead of once per row.
+        find_cells = self.CELL_PATTERN.findall
+        arrival_times = self.arrival_times
+        # Every process row should have as many cells as the first one.
+        num_columns = 0
+
+        rows = self.ROW_PATTERN.finditer(data, tbody_start, tbody_end)
+        for row_match in rows:
+            # Cells may wrap their text in child markup, so strip it.
+            cells = [get_cell_text(cell)
+                     for cell in find_cells(row_match.group(1))]
+
+            # Handle the special last row (averages).  Average waiting
+            # time comes after the one for turnaround.
+            if cells and cells[0] == b"Average":
+                averages = [cell for cell in cells[1:] if cell]
+                if len(averages) < 2:
+                    raise ValueError(
+                        "Unexpectedly unable to get the average waiting "
+                        "time from the output table.")
+                self.average_waiting_time = float(averages[1].split()[-1])
+                continue
+
+            if len(cells) < 2:
                 raise ValueError(
-                    "Unexpectedly unable to get the PID "
+                    "Unexpectedly unable to get the PID and arrival time "
                     "for a process in the output table.")
-            # Write and reset.
-            self.arrival_times[self.current_pid] = int(data)
-            self.current_pid = None
+            if num_columns == 0:
+                num_columns = len(cells)
+            elif len(cells) != num_columns:
+                raise ValueError(
+                    f"Unexpectedly found {len(cells)} cells in a row of the "
+                    f"output table instead of {num_columns}.")
+
+            # PID is field $1, Arrival Time is field $2.
+            pid, arrival_string = cells[0], cells[1]
+            arrival_times[pid] = int(arrival_string)
 
-    def get_arrival_times(self) -> Dict[str, int]:
+        if not arrival_times or self.average_waiting_time == float("inf"):
+            raise ValueError(
+                "Unexpectedly unable to get the processes and averages "
+                "from the output table.")
+
+    def get_arrival_times(self) -> Dict[bytes, int]:
         return self.arrival_times
 
     def get_average_waiting_time(self) -> float:
         return self.average_waiting_time
 
 
-def get_average_response_time(pids: List[str],
+def get_average_response_time(pids: List[bytes],
                              times: List[int],
-                             arrival_times: Dict[str, int]
+                             arrival_times: Dict[bytes, int]
                              ) -> float:
     """
     Given the parsed PIDs and times from the Gantt Chart and arrival
     times from the output table, compute the average response time.
     """
-    total_response_time = 0
-    num_processes = len(arrival_times.keys())
+    num_processes = len(arrival_times)
 
     # We only act on the FIRST instance of a PID (since we need the time
     # at which it FIRST executes).
-    seen_pids: Set[str] = set()
+    first_exec_times: Dict[bytes, int] = {}
 
     # len(times) = len(pids) + 1 because it includes the final end time,
     # so that will be excluded, which is fine.
-    for pid, first_exec_time in zip(pids, times):
-        # "PID" is "_" in chart for slots where no process is executing.
-        if pid in seen_pids or pid == "_":
-            continue
-        arrival_time = arrival_times[pid]
-        total_response_time += (first_exec_time - arrival_time)
-        seen_pids.add(pid)
+    for pid, time in zip(pids, times):
+        first_exec_times.setdefault(pid, time)
+
+    # "PID" is "_" in chart for slots where no process is executing.
+    first_exec_times.pop(b"_", None)
+
+    total_response_time = sum(first_exec_time - arrival_times[pid]
+                              for pid, first_exec_time
+                              in first_exec_times.items())
 
     return float(total_response_time / num_processes)
 
@@ -214,7 +250,8 @@ def main() -> None:
         sys.exit(22)
 
     filename = sys.argv[1]
-    with open(filename, "rt", encoding="utf-8") as fp:
+    # Work on the raw bytes; everything we extract is ASCII anyway.
+    with open(filename, "rb") as fp:
         raw_html = fp.read()
 
     chart_parser = GanttChartParser()